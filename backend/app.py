@@ -1,8 +1,19 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
 from dotenv import load_dotenv
-import os, time, datetime, httpx
-from typing import Any, Dict, Optional, List, Any as TypingAny
+import os, time, datetime, atexit, bisect, threading, httpx, orjson
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_exponential,
+)
+from typing import Any, Callable, Dict, Optional, List, Any as TypingAny
 
 # Load environment variables from .env file if present
 load_dotenv()
@@ -10,6 +21,14 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
+def json_response(payload: Any, status: int = 200) -> Response:
+    """Serialise payload with orjson (faster than jsonify, no key sorting)."""
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype="application/json",
+    )
+
 # Coordinates for the spot (defaults to Stella Maris, Salvador-BA)
 LAT = float(os.getenv("LAT", "-12.9437"))
 LON = float(os.getenv("LON", "-38.3539"))
@@ -19,29 +38,155 @@ STORMGLASS_API_KEY = os.getenv("STORMGLASS_API_KEY") or ""
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY") or ""
 TIDE_API_URL = os.getenv("TIDE_API_URL") or ""
 TIDE_LOCATION = os.getenv("TIDE_LOCATION", "Salvador")
+# Corrigido: a API usa o nome da cidade no path
+TIDE_URL = f"{TIDE_API_URL}/{TIDE_LOCATION}" if TIDE_API_URL else ""
+TIDE_CACHE_KEY = f"tide:{TIDE_LOCATION}"
+
+# Shared HTTP client so keep-alive connections are reused across requests
+HTTP = httpx.Client(
+    http2=True,
+    timeout=15,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+)
+atexit.register(HTTP.close)
 
-# Simple in-memory cache with TTL to avoid excessive API calls
+# Retry transient upstream failures (network errors and 5xx) with backoff.
+# 4xx answers are returned as-is; after the last attempt the final
+# response is returned (or its exception re-raised) for the caller to handle.
+# Retries stop once 5s have passed, so a timed-out attempt (>=10s) is never
+# repeated and a hung upstream costs one client timeout, not three.
+@retry(
+    stop=stop_after_attempt(3) | stop_after_delay(5),
+    wait=wait_exponential(multiplier=0.2, max=2),
+    retry=retry_if_exception_type(httpx.TransportError) | retry_if_result(lambda r: r.status_code >= 500),
+    retry_error_callback=lambda state: state.outcome.result(),
+)
+def http_get(url: str, **kwargs: Any) -> httpx.Response:
+    return HTTP.get(url, **kwargs)
+
+# Simple in-memory cache with TTL to avoid excessive API calls.
+# Entries are kept in insertion order, so expired ones normally sit at the
+# front and can be dropped without scanning the whole store.
+# After ``ttl_seconds`` a value is stale: plain lookups miss, but lookups
+# that pass a ``refresh`` callable keep serving it while a background
+# worker re-fetches, until ``hard_ttl_seconds`` when it is dropped.
+# Concurrent misses on the same key are coalesced into one fetch.
 class TTLCache:
-    def __init__(self, ttl_seconds: int = 300):
+    def __init__(
+        self,
+        ttl_seconds: int = 300,
+        hard_ttl_seconds: int = 900,
+        maxsize: int = 256,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
         self.ttl = ttl_seconds
-        self.store: Dict[str, Any] = {}
+        self.hard_ttl = max(hard_ttl_seconds, ttl_seconds)
+        self.maxsize = maxsize
+        self.executor = executor
+        self.store: "OrderedDict[str, Any]" = OrderedDict()
+        self._refreshing: set = set()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
 
-    def get(self, key: str) -> Optional[TypingAny]:
-        item = self.store.get(key)
-        if not item:
-            return None
-        ts, value = item
-        if time.time() - ts > self.ttl:
-            # Expired entry
-            self.store.pop(key, None)
-            return None
+    def _evict_expired(self, now: float) -> None:
+        # Caller must hold the lock
+        while self.store:
+            ts, _ = next(iter(self.store.values()))
+            if now - ts <= self.hard_ttl:
+                break
+            self.store.popitem(last=False)
+
+    def get(self, key: str, refresh: Optional[Callable[[], Any]] = None) -> Optional[TypingAny]:
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            item = self.store.get(key)
+            if not item:
+                return None
+            ts, value = item
+            if now - ts <= self.ttl:
+                return value
+            if now - ts > self.hard_ttl:
+                # Back-dated entry (see set()) that the front sweep missed
+                del self.store[key]
+                return None
+            if refresh is None or self.executor is None:
+                return None
+            # Stale but still usable: serve it and refresh once in background
+            schedule = key not in self._refreshing
+            if schedule:
+                self._refreshing.add(key)
+        if schedule:
+            self.executor.submit(self._refresh, key, refresh)
         return value
 
-    def set(self, key: str, value: TypingAny) -> None:
-        self.store[key] = (time.time(), value)
+    def set(self, key: str, value: TypingAny, ts: Optional[float] = None) -> None:
+        """Store value; ``ts`` back-dates it, e.g. to the age of the data it was derived from."""
+        with self._lock:
+            self.store[key] = (time.time() if ts is None else ts, value)
+            self.store.move_to_end(key)
+            while len(self.store) > self.maxsize:
+                self.store.popitem(last=False)
+
+    def stored_at(self, key: str, value: TypingAny) -> Optional[float]:
+        """Return when ``value`` was stored under key, or None if it has been replaced or dropped."""
+        with self._lock:
+            item = self.store.get(key)
+        if item and item[1] is value:
+            return item[0]
+        return None
+
+    def fetch(self, key: str, fetch_fn: Callable[[], Any]) -> Optional[TypingAny]:
+        """Return the cached value for key, calling fetch_fn on a miss."""
+        value = self.get(key, refresh=fetch_fn)
+        if value is not None:
+            return value
+        with self._lock:
+            # Another thread may have filled the entry since our miss
+            item = self.store.get(key)
+            if item and time.time() - item[0] <= self.ttl:
+                return item[1]
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+        if not leader:
+            # Someone else is already fetching: wait and share their result
+            event.wait()
+            return self.get(key)
+        try:
+            value = fetch_fn()
+            if value is not None:
+                self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def _refresh(self, key: str, fetch_fn: Callable[[], Any]) -> None:
+        try:
+            value = fetch_fn()
+            if value is not None:
+                self.set(key, value)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+# Background workers that re-fetch stale cache entries
+refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+# Instantiate cache (2.5 minute freshness, stale values served up to 10 minutes)
+cache = TTLCache(ttl_seconds=150, hard_ttl_seconds=600, executor=refresh_pool)
+
+def source_key(source: str, lat: float, lon: float) -> str:
+    """Cache key for an upstream payload at the given coordinates."""
+    return f"{source}:{lat:.4f},{lon:.4f}"
 
-# Instantiate cache (3 minute TTL)
-cache = TTLCache(ttl_seconds=180)
+# Worker pool used to query the upstream APIs concurrently
+fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="upstream")
 
 # Helper functions for time parsing
 def parse_iso_list(iso_list: List[str]) -> List[datetime.datetime]:
@@ -49,20 +194,25 @@ def parse_iso_list(iso_list: List[str]) -> List[datetime.datetime]:
     return [datetime.datetime.fromisoformat(t) for t in iso_list]
 
 def nearest_index(times: List[datetime.datetime], now: Optional[datetime.datetime] = None) -> int:
-    """Return index of time closest to now."""
+    """Return index of time closest to now (``times`` must be sorted ascending)."""
     if not times:
         return 0
     if now is None:
         now = datetime.datetime.now()
-    return min(range(len(times)), key=lambda i: abs(times[i] - now))
+    i = bisect.bisect_left(times, now)
+    if i == 0:
+        return 0
+    if i == len(times):
+        return i - 1
+    # Only the two neighbours of the insertion point can be the closest
+    return i if times[i] - now < now - times[i - 1] else i - 1
 
 # ---------- Open-Meteo Marine API ----------
 def fetch_open_meteo(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     """Fetch hourly marine data from Open-Meteo."""
-    key = f"openmeteo:{lat:.4f},{lon:.4f}"
-    cached = cache.get(key)
-    if cached:
-        return cached
+    return cache.fetch(source_key("openmeteo", lat, lon), lambda: _do_fetch_open_meteo(lat, lon))
+
+def _do_fetch_open_meteo(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     url = "https://marine-api.open-meteo.com/v1/marine"
     params = {
         "latitude": lat,
@@ -72,20 +222,23 @@ def fetch_open_meteo(lat: float, lon: float) -> Optional[Dict[str, Any]]:
         "timezone": "auto",
     }
     try:
-        r = httpx.get(url, params=params, timeout=15)
+        r = http_get(url, params=params)
         r.raise_for_status()
-        data = r.json()
-        cache.set(key, data)
-        return data
+        return orjson.loads(r.content)
     except Exception:
         return None
 
-def pick_open_meteo_point(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def pick_open_meteo_point(data: Dict[str, Any], now: Optional[datetime.datetime] = None) -> Optional[Dict[str, Any]]:
     """Pick the forecast hour closest to now from Open-Meteo data."""
     try:
         times_iso = data["hourly"]["time"]
-        times = parse_iso_list(times_iso)
-        idx = nearest_index(times)
+        # ISO8601 strings sort lexicographically, so bisect the raw list and
+        # only parse the two candidate neighbours
+        if now is None:
+            now = datetime.datetime.now()
+        i = bisect.bisect_left(times_iso, now.isoformat(timespec="seconds"))
+        lo = max(i - 1, 0)
+        idx = lo + nearest_index(parse_iso_list(times_iso[lo:i + 1]), now)
         return {
             "time": times_iso[idx],
             "wave_height_m": data["hourly"]["wave_height"][idx],
@@ -104,10 +257,9 @@ def fetch_stormglass(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     """Fetch swell, wind and wave data from Stormglass (if API key provided)."""
     if not STORMGLASS_API_KEY:
         return None
-    key = f"stormglass:{lat:.4f},{lon:.4f}"
-    cached = cache.get(key)
-    if cached:
-        return cached
+    return cache.fetch(source_key("stormglass", lat, lon), lambda: _do_fetch_stormglass(lat, lon))
+
+def _do_fetch_stormglass(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     url = "https://api.stormglass.io/v2/weather/point"
     params = {
         "lat": lat,
@@ -120,43 +272,50 @@ def fetch_stormglass(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     }
     headers = {"Authorization": STORMGLASS_API_KEY}
     try:
-        r = httpx.get(url, params=params, headers=headers, timeout=15)
+        r = http_get(url, params=params, headers=headers)
         if r.status_code == 429:
             return None
         r.raise_for_status()
-        data = r.json()
-        cache.set(key, data)
-        return data
+        return orjson.loads(r.content)
     except Exception:
         return None
 
-def pick_stormglass_point(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+# Stormglass reports each variable per model; use the first available in this order
+_PREFS = ("noaa", "dwd", "meteo", "icon", "sg")
+
+@lru_cache(maxsize=1024)
+def _parse_sg_ts(s: str) -> datetime.datetime:
+    """Parse a Stormglass UTC timestamp into local time (memoised, hours repeat across refreshes)."""
+    return datetime.datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone()
+
+def _choose_source_value(src_dict: Dict[str, Any]) -> Optional[float]:
+    """Pick one numeric value from a Stormglass per-source dict."""
+    if not isinstance(src_dict, dict):
+        return None
+    v = next((v for v in map(src_dict.get, _PREFS) if isinstance(v, (int, float))), None)
+    if v is None:
+        v = next((v for v in src_dict.values() if isinstance(v, (int, float))), None)
+    return float(v) if v is not None else None
+
+def pick_stormglass_point(data: Dict[str, Any], now: Optional[datetime.datetime] = None) -> Optional[Dict[str, Any]]:
     """Pick the hour closest to now and normalise Stormglass data."""
     try:
         hours = data.get("hours", [])
         if not hours:
             return None
-        ts = [datetime.datetime.fromisoformat(h["time"].replace("Z", "+00:00")).astimezone() for h in hours]
-        idx = nearest_index(ts)
-        def choose(src_dict: Dict[str, Any]) -> Optional[float]:
-            if not isinstance(src_dict, dict):
-                return None
-            for pref in ["noaa", "dwd", "meteo", "icon", "sg"]:
-                if pref in src_dict and isinstance(src_dict[pref], (int, float)):
-                    return float(src_dict[pref])
-            for v in src_dict.values():
-                if isinstance(v, (int, float)):
-                    return float(v)
-            return None
+        ts = [_parse_sg_ts(h["time"]) for h in hours]
+        # Stormglass times are timezone-aware; comparing them with a naive now
+        # raises TypeError, which used to drop every Stormglass point
+        idx = nearest_index(ts, (now or datetime.datetime.now()).astimezone())
         h = hours[idx]
-        wave_height = choose(h.get("waveHeight", {}))
-        wave_period = choose(h.get("wavePeriod", {}))
-        wave_direction = choose(h.get("waveDirection", {}))
-        swell_height = choose(h.get("swellHeight", {}))
-        swell_period = choose(h.get("swellPeriod", {}))
-        swell_direction = choose(h.get("swellDirection", {}))
-        wind_speed_ms = choose(h.get("windSpeed", {}))
-        wind_direction = choose(h.get("windDirection", {}))
+        wave_height = _choose_source_value(h.get("waveHeight", {}))
+        wave_period = _choose_source_value(h.get("wavePeriod", {}))
+        wave_direction = _choose_source_value(h.get("waveDirection", {}))
+        swell_height = _choose_source_value(h.get("swellHeight", {}))
+        swell_period = _choose_source_value(h.get("swellPeriod", {}))
+        swell_direction = _choose_source_value(h.get("swellDirection", {}))
+        wind_speed_ms = _choose_source_value(h.get("windSpeed", {}))
+        wind_direction = _choose_source_value(h.get("windDirection", {}))
         wind_speed_kmh = float(wind_speed_ms) * 3.6 if wind_speed_ms is not None else None
         return {
             "time": h["time"],
@@ -178,10 +337,9 @@ def fetch_openweather(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     """Fetch current weather (wind, clouds, rain, temp) from OpenWeather (if API key provided)."""
     if not OPENWEATHER_API_KEY:
         return None
-    key = f"openweather:{lat:.4f},{lon:.4f}"
-    cached = cache.get(key)
-    if cached:
-        return cached
+    return cache.fetch(source_key("openweather", lat, lon), lambda: _do_fetch_openweather(lat, lon))
+
+def _do_fetch_openweather(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     url = "https://api.openweathermap.org/data/2.5/weather"
     params = {
         "lat": lat,
@@ -190,11 +348,9 @@ def fetch_openweather(lat: float, lon: float) -> Optional[Dict[str, Any]]:
         "units": "metric",
     }
     try:
-        r = httpx.get(url, params=params, timeout=10)
+        r = http_get(url, params=params, timeout=10)
         r.raise_for_status()
-        data = r.json()
-        cache.set(key, data)
-        return data
+        return orjson.loads(r.content)
     except Exception:
         return None
 
@@ -218,22 +374,17 @@ def pick_openweather_now(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return None
 
 # ---------- Tide API (Tabua-Mare) ----------
-def fetch_tide(location: str) -> Optional[Any]:
-    """Fetch tide information from API-Tabua-Mare."""
-    if not TIDE_API_URL:
+def fetch_tide() -> Optional[Any]:
+    """Fetch tide information for TIDE_LOCATION from API-Tabua-Mare."""
+    if not TIDE_URL:
         return None
-    key = f"tide:{location}"
-    cached = cache.get(key)
-    if cached:
-        return cached
+    return cache.fetch(TIDE_CACHE_KEY, _do_fetch_tide)
+
+def _do_fetch_tide() -> Optional[Any]:
     try:
-        # Corrigido: a API usa o nome da cidade no path
-        url = f"{TIDE_API_URL}/{location}"
-        r = httpx.get(url, timeout=10)
+        r = http_get(TIDE_URL, timeout=10)
         r.raise_for_status()
-        data = r.json()
-        cache.set(key, data)
-        return data
+        return orjson.loads(r.content)
     except Exception as e:
         print("Erro ao buscar maré:", e)
         return None
@@ -284,64 +435,122 @@ def merge_forecast(
     return merged
 
 # ---------- Explanation generator ----------
+# One template per user level; "avancado" is also the fallback
+EXPLAIN_TEMPLATES = {
+    "iniciante": (
+        "O mar está com ~{h:.1f} m e período de {p:.0f}s. "
+        "Vento {w:.0f} km/h ({d}°). Priorize período >10s e vento fraco."
+    ),
+    "intermediario": (
+        "Altura {h:.1f} m; Tp {p:.0f}s; vento {w:.0f} km/h @{d}°. "
+        "Se o vento girar terral, melhora bastante."
+    ),
+    "avancado": (
+        "Hs={h:.1f} m, Tp={p:.0f}s, W={w:.0f} km/h@{d}°. "
+        "Combine swell+vento na escolha do pico/horário."
+    ),
+}
+
 def explain(level: str, merged: Dict[str, Any]) -> str:
     """Create a simple Portuguese explanation based on the user's level."""
-    h = merged.get("wave_height_m", 0.0)
-    p = merged.get("wave_period_s", 0.0)
-    w = merged.get("wind_speed_kmh", 0.0)
-    d = merged.get("wind_direction_deg", 0)
-    if level == "iniciante":
-        return (
-            f"O mar está com ~{h:.1f} m e período de {p:.0f}s. "
-            f"Vento {w:.0f} km/h ({d}°). Priorize período >10s e vento fraco."
-        )
-    if level == "intermediario":
-        return (
-            f"Altura {h:.1f} m; Tp {p:.0f}s; vento {w:.0f} km/h @{d}°. "
-            "Se o vento girar terral, melhora bastante."
-        )
-    # avançado
-    return (
-        f"Hs={h:.1f} m, Tp={p:.0f}s, W={w:.0f} km/h@{d}°. "
-        "Combine swell+vento na escolha do pico/horário."
-    )
+    # Sources may report a field as None, which .get() defaults don't cover
+    values = {
+        "h": merged.get("wave_height_m") or 0.0,
+        "p": merged.get("wave_period_s") or 0.0,
+        "w": merged.get("wind_speed_kmh") or 0.0,
+        "d": merged.get("wind_direction_deg") or 0,
+    }
+    template = EXPLAIN_TEMPLATES.get(level, EXPLAIN_TEMPLATES["avancado"])
+    return template.format(**values)
+
+# ---------- Forecast assembly ----------
+def collect_forecast() -> Dict[str, Any]:
+    """
+    Fetch every source, merge them and render the explanation for each level.
+    The result is cached once and shared by all levels.
+    """
+    key = source_key("forecast", LAT, LON)
+    cached = cache.get(key)
+    if cached:
+        return cached
+    # Fire all upstream requests at once so latency is max(), not sum()
+    om_future = fetch_pool.submit(fetch_open_meteo, LAT, LON)
+    sg_future = fetch_pool.submit(fetch_stormglass, LAT, LON)
+    ow_future = fetch_pool.submit(fetch_openweather, LAT, LON)
+    tide_future = fetch_pool.submit(fetch_tide)
+    # One clock read so every source picks against the same instant
+    now = datetime.datetime.now()
+    om_raw = om_future.result()
+    om_point = pick_open_meteo_point(om_raw, now) if om_raw else None
+    sg_raw = sg_future.result()
+    sg_point = pick_stormglass_point(sg_raw, now) if sg_raw else None
+    ow_raw = ow_future.result()
+    ow_now = pick_openweather_now(ow_raw) if ow_raw else None
+    merged = merge_forecast(om_point, sg_point, ow_now)
+    # Render every level up front so switching levels is a dict lookup
+    if merged.get("wave_height_m"):
+        explanations = {lvl: explain(lvl, merged) for lvl in EXPLAIN_TEMPLATES}
+    else:
+        explanations = {}
+    tide = tide_future.result()
+    forecast = {
+        "merged": merged,
+        "explanations": explanations,
+        "open_meteo": om_point,
+        "stormglass": sg_point,
+        "openweather": ow_now,
+        "tide": tide,
+    }
+    # Don't pin a "no data" answer in the cache while upstreams are failing
+    if not merged.get("wave_height_m"):
+        return forecast
+    # The forecast is only as fresh as its oldest input, which may be a
+    # stale value served while a refresh runs. Back-date the entry so it
+    # expires when that input does; if an input was already replaced we
+    # can't tell its age, so don't cache at all.
+    inputs = [
+        (source_key("openmeteo", LAT, LON), om_raw),
+        (source_key("stormglass", LAT, LON), sg_raw),
+        (source_key("openweather", LAT, LON), ow_raw),
+        (TIDE_CACHE_KEY, tide),
+    ]
+    stamps = [cache.stored_at(k, v) for k, v in inputs if v is not None]
+    if None not in stamps:
+        cache.set(key, forecast, ts=min(stamps, default=None))
+    return forecast
 
 # ---------- Flask routes ----------
 @app.get("/api/explain")
 def api_explain():
     level = (request.args.get("level") or "iniciante").lower()
     if level not in {"iniciante", "intermediario", "avancado"}:
-        return jsonify({"error": "level inválido. Use: iniciante|intermediario|avancado"}), 400
-    om_raw = fetch_open_meteo(LAT, LON)
-    om_point = pick_open_meteo_point(om_raw) if om_raw else None
-    sg_raw = fetch_stormglass(LAT, LON)
-    sg_point = pick_stormglass_point(sg_raw) if sg_raw else None
-    ow_raw = fetch_openweather(LAT, LON)
-    ow_now = pick_openweather_now(ow_raw) if ow_raw else None
-    merged = merge_forecast(om_point, sg_point, ow_now)
-    tide = fetch_tide(TIDE_LOCATION)
-    explanation_pt = explain(level, merged) if merged.get("wave_height_m") else "Sem dados suficientes no momento."
-    return jsonify({
+        return json_response({"error": "level inválido. Use: iniciante|intermediario|avancado"}, 400)
+    forecast = collect_forecast()
+    merged = forecast["merged"]
+    explanation_pt = forecast["explanations"].get(level) or "Sem dados suficientes no momento."
+    return json_response({
         "spot": "Stella Maris, Salvador-BA",
         "level": level,
         "time_ref": merged.get("time"),
         "merged": merged,
-        "open_meteo": om_point,
-        "stormglass": sg_point,
-        "openweather": ow_now,
-        "tide": tide,
+        "open_meteo": forecast["open_meteo"],
+        "stormglass": forecast["stormglass"],
+        "openweather": forecast["openweather"],
+        "tide": forecast["tide"],
         "explanation_pt": explanation_pt,
     })
 
 @app.get("/api/tide")
 def api_tide():
     """Endpoint para testar apenas a maré"""
-    data = fetch_tide(TIDE_LOCATION)
-    return jsonify(data or {"error": "Sem dados de maré"})
+    data = fetch_tide()
+    return json_response(data or {"error": "Sem dados de maré"})
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return json_response({"status": "ok"})
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000, debug=True)
+    # Development server only; in production run under gunicorn (see README).
+    # Flask reads FLASK_DEBUG itself, so debug mode stays opt-in.
+    app.run(host="0.0.0.0", port=8000)
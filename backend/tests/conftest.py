@@ -0,0 +1,59 @@
+import os
+import sys
+import types
+
+import pytest
+
+# app.py lives one level up and is not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for the ``time`` module inside app.py."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class ManualExecutor:
+    """Queues submitted refreshes until run_all() is called."""
+
+    def __init__(self) -> None:
+        self.pending = []
+
+    def submit(self, fn, *args):
+        self.pending.append((fn, args))
+
+    def run_all(self) -> None:
+        pending, self.pending = self.pending, []
+        for fn, args in pending:
+            fn(*args)
+
+
+class InlineExecutor:
+    """Runs submitted refreshes immediately, like a refresh that wins the race."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(app, "time", types.SimpleNamespace(time=fake.time))
+    return fake
+
+
+@pytest.fixture
+def manual_executor():
+    return ManualExecutor()
+
+
+@pytest.fixture
+def inline_executor():
+    return InlineExecutor()
@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+
+
+def test_soft_ttl_serves_stale_value_and_refreshes_once(clock, manual_executor):
+    cache = app.TTLCache(ttl_seconds=150, hard_ttl_seconds=600, executor=manual_executor)
+    cache.set("k", "v1")
+    clock.now += 100
+    assert cache.get("k", refresh=lambda: "v2") == "v1"
+    assert manual_executor.pending == []
+
+    clock.now += 60
+    assert cache.get("k") is None  # plain lookups treat stale as a miss
+    assert cache.get("k", refresh=lambda: "v2") == "v1"
+    assert cache.get("k", refresh=lambda: "v2") == "v1"
+    assert len(manual_executor.pending) == 1
+
+    manual_executor.run_all()
+    assert cache.get("k") == "v2"
+
+
+def test_hard_ttl_drops_entry(clock, manual_executor):
+    cache = app.TTLCache(ttl_seconds=150, hard_ttl_seconds=600, executor=manual_executor)
+    cache.set("k", "v1")
+    clock.now += 601
+    assert cache.get("k", refresh=lambda: "v2") is None
+    assert "k" not in cache.store
+    assert manual_executor.pending == []
+
+
+def test_backdated_entry_expires_from_its_timestamp(clock):
+    cache = app.TTLCache(ttl_seconds=150, hard_ttl_seconds=600)
+    cache.set("k", "v", ts=clock.now - 140)
+    assert cache.get("k") == "v"
+    clock.now += 11
+    assert cache.get("k") is None
+
+
+def test_stored_at_tracks_the_exact_value(clock):
+    cache = app.TTLCache(ttl_seconds=150)
+    value = {"v": 1}
+    cache.set("k", value)
+    assert cache.stored_at("k", value) == clock.now
+    assert cache.stored_at("k", {"v": 1}) is None  # equal but not the same object
+    cache.set("k", {"v": 2})
+    assert cache.stored_at("k", value) is None
+
+
+def test_maxsize_evicts_oldest(clock):
+    cache = app.TTLCache(ttl_seconds=150, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2 and cache.get("c") == 3
+
+
+def run_blocked_behind_leader(cache, result, workers):
+    """Call cache.fetch from every worker while the first fetch is held open."""
+    calls = []
+    arrived = []
+    release = threading.Event()
+
+    def fetch_fn():
+        calls.append(1)
+        release.wait(timeout=5)
+        return result
+
+    def worker(_):
+        arrived.append(1)
+        return cache.fetch("k", fetch_fn)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(worker, i) for i in range(workers)]
+        while len(arrived) < workers:
+            time.sleep(0.01)
+        # Give the followers time to park on the in-flight event
+        time.sleep(0.1)
+        release.set()
+        results = [f.result() for f in futures]
+    return calls, results
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = app.TTLCache(ttl_seconds=150)
+    calls, results = run_blocked_behind_leader(cache, {"v": 1}, workers=20)
+    assert len(calls) == 1
+    assert all(r == {"v": 1} for r in results)
+
+
+def test_waiters_share_failed_fetch_instead_of_refetching():
+    cache = app.TTLCache(ttl_seconds=150)
+    calls, results = run_blocked_behind_leader(cache, None, workers=5)
+    assert len(calls) == 1
+    assert results == [None] * 5
+    assert "k" not in cache.store and not cache._inflight
+    assert cache.fetch("k", lambda: "ok") == "ok"
@@ -0,0 +1,143 @@
+import datetime
+
+import pytest
+
+import app
+
+
+def open_meteo_payload(height: float) -> dict:
+    base = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    times = [(base + datetime.timedelta(hours=h)).isoformat(timespec="minutes") for h in range(-3, 4)]
+    hourly = {"time": times}
+    for field in ("wave_height", "wave_period", "wave_direction",
+                  "wind_wave_height", "wind_wave_period", "wind_wave_direction"):
+        hourly[field] = [height] * len(times)
+    return {"hourly": hourly}
+
+
+@pytest.fixture
+def upstream(monkeypatch, clock):
+    """Only Open-Meteo enabled; each fetch returns the next queued payload."""
+    monkeypatch.setattr(app, "STORMGLASS_API_KEY", "")
+    monkeypatch.setattr(app, "OPENWEATHER_API_KEY", "")
+    monkeypatch.setattr(app, "TIDE_URL", "")
+    responses = []
+    monkeypatch.setattr(app, "_do_fetch_open_meteo", lambda lat, lon: responses.pop(0))
+    return responses
+
+
+def use_cache(monkeypatch, executor) -> app.TTLCache:
+    cache = app.TTLCache(ttl_seconds=150, hard_ttl_seconds=600, executor=executor)
+    monkeypatch.setattr(app, "cache", cache)
+    return cache
+
+
+def forecast_key() -> str:
+    return app.source_key("forecast", app.LAT, app.LON)
+
+
+# ---------- collect_forecast ----------
+def test_forecast_built_from_stale_input_expires_with_it(monkeypatch, clock, upstream, manual_executor):
+    cache = use_cache(monkeypatch, manual_executor)
+    upstream.extend([open_meteo_payload(1.0), open_meteo_payload(2.0)])
+
+    assert app.collect_forecast()["merged"]["wave_height_m"] == 1.0
+    clock.now += 160
+    # Upstream value is stale and its refresh is still pending
+    assert app.collect_forecast()["merged"]["wave_height_m"] == 1.0
+    assert cache.get(forecast_key()) is None
+
+    manual_executor.run_all()
+    assert app.collect_forecast()["merged"]["wave_height_m"] == 2.0
+    clock.now += 149
+    assert cache.get(forecast_key())["merged"]["wave_height_m"] == 2.0
+
+
+def test_forecast_not_cached_when_input_replaced_mid_build(monkeypatch, clock, upstream, inline_executor):
+    cache = use_cache(monkeypatch, inline_executor)
+    upstream.extend([open_meteo_payload(1.0), open_meteo_payload(2.0)])
+
+    app.collect_forecast()
+    clock.now += 160
+    # The stale 1.0 payload is served while the refresh swaps in 2.0
+    assert app.collect_forecast()["merged"]["wave_height_m"] == 1.0
+    assert cache.get(forecast_key()) is None
+    assert app.collect_forecast()["merged"]["wave_height_m"] == 2.0
+
+
+def test_forecast_without_waves_is_not_cached(monkeypatch, clock, upstream, manual_executor):
+    cache = use_cache(monkeypatch, manual_executor)
+    upstream.extend([None, open_meteo_payload(1.5)])
+
+    assert app.collect_forecast()["explanations"] == {}
+    assert cache.get(forecast_key()) is None
+    clock.now += 5
+    forecast = app.collect_forecast()
+    assert forecast["merged"]["wave_height_m"] == 1.5
+    assert set(forecast["explanations"]) == set(app.EXPLAIN_TEMPLATES)
+
+
+# ---------- pickers ----------
+OM_FIELDS = ("wave_height", "wave_period", "wave_direction",
+             "wind_wave_height", "wind_wave_period", "wind_wave_direction")
+
+
+def open_meteo_hours(times):
+    """Open-Meteo hourly block whose values equal each slot's index."""
+    hourly = {"time": times}
+    for field in OM_FIELDS:
+        hourly[field] = [float(i) for i in range(len(times))]
+    return {"hourly": hourly}
+
+
+@pytest.mark.parametrize("now, expected", [
+    (datetime.datetime(2024, 5, 1, 2, 0), 2),     # exact hour: "T02:00" sorts before "T02:00:00"
+    (datetime.datetime(2024, 5, 1, 2, 29), 2),
+    (datetime.datetime(2024, 5, 1, 2, 31), 3),
+    (datetime.datetime(2024, 4, 30, 20, 0), 0),   # before the first hour
+    (datetime.datetime(2024, 5, 1, 9, 0), 5),     # after the last hour
+])
+def test_open_meteo_point_picks_closest_hour(now, expected):
+    times = [f"2024-05-01T{h:02d}:00" for h in range(6)]
+    point = app.pick_open_meteo_point(open_meteo_hours(times), now)
+    assert point["time"] == times[expected]
+    assert point["wave_height_m"] == float(expected)
+
+
+def test_open_meteo_point_without_hours_is_none():
+    assert app.pick_open_meteo_point(open_meteo_hours([]), datetime.datetime(2024, 5, 1)) is None
+
+
+def stormglass_payload(local_hours):
+    """Hours as Stormglass sends them: UTC '...Z' strings, one model value each."""
+    hours = []
+    for i, local in enumerate(local_hours):
+        utc = local.astimezone(datetime.timezone.utc)
+        hours.append({
+            "time": utc.strftime("%Y-%m-%dT%H:%M:%S+00:00").replace("+00:00", "Z"),
+            "waveHeight": {"noaa": float(i)},
+        })
+    return {"hours": hours}
+
+
+def test_stormglass_point_with_naive_now_picks_closest_hour():
+    base = datetime.datetime(2024, 5, 1, 12, 0)
+    data = stormglass_payload([base + datetime.timedelta(hours=h) for h in range(-2, 3)])
+    point = app.pick_stormglass_point(data, base + datetime.timedelta(minutes=20))
+    assert point is not None
+    assert point["wave_height_m"] == 2.0
+    assert point["time"] == data["hours"][2]["time"]
+
+
+# ---------- explain ----------
+@pytest.mark.parametrize("level", ["iniciante", "intermediario", "avancado"])
+def test_explain_renders_with_missing_fields(level):
+    merged = {
+        "wave_height_m": 1.24,
+        "wave_period_s": None,
+        "wind_speed_kmh": None,
+        "wind_direction_deg": None,
+    }
+    text = app.explain(level, merged)
+    assert text == app.EXPLAIN_TEMPLATES[level].format(h=1.24, p=0.0, w=0.0, d=0)
+    assert "1.2 m" in text
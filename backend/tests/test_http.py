@@ -0,0 +1,81 @@
+import types
+
+import httpx
+import pytest
+import tenacity
+
+import app
+
+
+class RetryClock:
+    """Fake monotonic clock for tenacity; backoff sleeps advance it instantly."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def retry_clock(monkeypatch):
+    fake = RetryClock()
+    monkeypatch.setattr(tenacity, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(app.http_get.retry, "sleep", fake.sleep)
+    return fake
+
+
+def mock_upstream(monkeypatch, handler):
+    """Route app.HTTP through handler and record every request it sees."""
+    calls = []
+
+    def recording(request):
+        calls.append(request)
+        return handler(request)
+
+    monkeypatch.setattr(app, "HTTP", httpx.Client(transport=httpx.MockTransport(recording)))
+    return calls
+
+
+def test_retries_5xx_until_success(monkeypatch, retry_clock):
+    statuses = iter([503, 503, 200])
+    calls = mock_upstream(monkeypatch, lambda request: httpx.Response(next(statuses)))
+    assert app.http_get("https://upstream.test/").status_code == 200
+    assert len(calls) == 3
+
+
+def test_returns_last_5xx_after_final_attempt(monkeypatch, retry_clock):
+    calls = mock_upstream(monkeypatch, lambda request: httpx.Response(503))
+    assert app.http_get("https://upstream.test/").status_code == 503
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("status", [404, 429])
+def test_does_not_retry_4xx(monkeypatch, retry_clock, status):
+    calls = mock_upstream(monkeypatch, lambda request: httpx.Response(status))
+    assert app.http_get("https://upstream.test/").status_code == status
+    assert len(calls) == 1
+
+
+def test_reraises_transport_error_after_final_attempt(monkeypatch, retry_clock):
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    calls = mock_upstream(monkeypatch, handler)
+    with pytest.raises(httpx.ConnectError):
+        app.http_get("https://upstream.test/")
+    assert len(calls) == 3
+
+
+def test_slow_failure_is_not_retried_past_delay_cap(monkeypatch, retry_clock):
+    def handler(request):
+        retry_clock.now += 10  # a full client timeout elapses
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    calls = mock_upstream(monkeypatch, handler)
+    with pytest.raises(httpx.ReadTimeout):
+        app.http_get("https://upstream.test/")
+    assert len(calls) == 1